@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Conversion job run in the server's worker processes
+Importing this module starts no threads and touches no files, so workers
+load it instead of server.py
+"""
+
+import logging
+import shutil
+import sys
+
+from gml2glb import convert_file
+
+LOG_FORMAT = "%(asctime)s %(levelname)s %(message)s"
+logger = logging.getLogger("server")
+
+def init_worker_logging():
+    """Log directly to stdout in conversion workers, which have no listener thread"""
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+def run_conversion(gml_path, output_dir, session_id):
+    """
+    Run the CityGML to GLB conversion in this (worker) process.
+    Output is written to a temporary directory and renamed to output_dir when complete.
+    Returns (success: bool, message: str)
+    """
+    work_dir = output_dir.with_name(f"{output_dir.name}.{session_id}.tmp")
+    try:
+        work_dir.mkdir(parents=True)
+        
+        # Output file path
+        glb_output = work_dir / "model.glb"
+        
+        logger.info("Converting: %s -> %s", gml_path, glb_output)
+        # Conversions are already spread over the pool, so parse serially
+        convert_file(str(gml_path), str(glb_output), workers=1)
+        
+        # Verify output files exist
+        glb_file = work_dir / "model.glb"
+        metadata_file = work_dir / "model_metadata.json"
+        
+        if not glb_file.exists():
+            return False, "GLB file was not generated"
+        
+        if not metadata_file.exists():
+            return False, "Metadata file was not generated"
+        
+        logger.info("✅ GLB conversion successful: %d bytes", glb_file.stat().st_size)
+        logger.info("✅ Metadata generated: %d bytes", metadata_file.stat().st_size)
+        
+        try:
+            work_dir.rename(output_dir)
+        except OSError:
+            # Another process converted the same content first
+            if not (output_dir / "model_metadata.json").exists():
+                raise
+        
+        return True, "Success"
+        
+    except Exception as e:
+        logger.error("Conversion failed: %s", e)
+        return False, f"Conversion failed: {str(e)}"
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
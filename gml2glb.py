@@ -4,12 +4,18 @@ CityGML to GLB/GLTF converter that groups surfaces by Building ID.
 Extracts building attributes: storeysAboveGround, storeysBelowGround, measuredHeight, gml:id, description.
 """
 
-import xml.etree.ElementTree as ET
+import glob
+import io
 import json
+import mmap
+import os
+import re
 import sys
 import struct
 from pathlib import Path
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 
 try:
     import numpy as np
@@ -17,29 +23,215 @@ except ImportError:
     print("Error: numpy is required. Install with: pip3 install numpy")
     sys.exit(1)
 
-def parse_citygml(gml_file):
-    """Parse CityGML and extract buildings with their surfaces grouped by Building ID."""
-    tree = ET.parse(gml_file)
-    root = tree.getroot()
-    
-    # Namespaces for CityGML 2.0
-    ns = {
-        'core': 'http://www.opengis.net/citygml/2.0',
-        'bldg': 'http://www.opengis.net/citygml/building/2.0',
-        'gml': 'http://www.opengis.net/gml',
-        'gen': 'http://www.opengis.net/citygml/generics/2.0'
-    }
+# orjson is optional; it serializes large metadata several times faster
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# mapbox_earcut is optional; without it polygons are fan-triangulated
+try:
+    import mapbox_earcut
+except ImportError:
+    mapbox_earcut = None
+
+# Prefer lxml's C parser; fall back to the stdlib C-accelerated ElementTree
+try:
+    from lxml import etree as ET
+    HAVE_LXML = True
+except ImportError:
+    import xml.etree.ElementTree as ET
+    HAVE_LXML = False
+
+# Fully-qualified CityGML 2.0 tags (avoids resolving prefixes on every lookup)
+BLDG_NS = '{http://www.opengis.net/citygml/building/2.0}'
+GML_NS = '{http://www.opengis.net/gml}'
+
+BLDG_BUILDING = BLDG_NS + 'Building'
+BLDG_ROOF = BLDG_NS + 'RoofSurface'
+BLDG_WALL = BLDG_NS + 'WallSurface'
+BLDG_GROUND = BLDG_NS + 'GroundSurface'
+BLDG_CLOSURE = BLDG_NS + 'ClosureSurface'
+BLDG_FLOOR = BLDG_NS + 'FloorSurface'
+BLDG_CEILING = BLDG_NS + 'CeilingSurface'
+BLDG_MEASURED_HEIGHT = BLDG_NS + 'measuredHeight'
+BLDG_STOREYS_ABOVE = BLDG_NS + 'storeysAboveGround'
+BLDG_STOREYS_BELOW = BLDG_NS + 'storeysBelowGround'
+GML_ID = GML_NS + 'id'
+GML_DESCRIPTION = GML_NS + 'description'
+GML_POLYGON = GML_NS + 'Polygon'
+GML_EXTERIOR = GML_NS + 'exterior'
+GML_LINEAR_RING = GML_NS + 'LinearRing'
+GML_POSLIST = GML_NS + 'posList'
+GML_POS = GML_NS + 'pos'
+
+# Schema path from a gml:Polygon to its exterior coordinates
+POLYGON_POSLIST_PATH = f'{GML_EXTERIOR}/{GML_LINEAR_RING}/{GML_POSLIST}'
+
+# Coordinate plane kept when projecting a ring whose normal is dominated by
+# x, y or z; the cyclic order keeps the projected winding sign equal to the
+# sign of that normal component
+PROJECTION_AXES = ((1, 2), (2, 0), (0, 1))
+
+# Largest distance (in CRS units) at which a ring's last point counts as
+# repeating its first
+CLOSING_TOLERANCE = 1e-9
+
+# Largest int16 grid coordinate used when quantizing vertex positions
+QUANTIZED_MAX = 32767
+
+# Large files are split into byte ranges of at least this size and parsed in parallel
+PARALLEL_CHUNK_BYTES = 16 * 1024 * 1024
+
+# Root element and top-level member start tags, matched on raw bytes; the
+# root's namespace prefix is captured to recognise its closing tag
+CITY_MODEL_RE = re.compile(rb'<((?:[A-Za-z_][\w.-]*:)?)CityModel\b[^>]*>')
+CITY_MODEL_END_RE = rb'</%sCityModel\s*>\s*$'
+CITY_OBJECT_MEMBER_RE = re.compile(rb'<(?:[A-Za-z_][\w.-]*:)?cityObjectMember\b')
+
+# Semantic surfaces collected per building, keyed by tag
+SURFACE_TAG_TYPES = {
+    BLDG_ROOF: 'RoofSurface',
+    BLDG_WALL: 'WallSurface',
+    BLDG_GROUND: 'GroundSurface',
+    BLDG_CLOSURE: 'ClosureSurface',
+    BLDG_FLOOR: 'FloorSurface',
+    BLDG_CEILING: 'CeilingSurface'
+}
+
+def iter_buildings(gml_file):
+    """Yield bldg:Building elements as soon as each one is fully parsed."""
+    if HAVE_LXML:
+        for _, elem in ET.iterparse(gml_file, events=('end',), tag=BLDG_BUILDING):
+            yield elem
+    else:
+        for _, elem in ET.iterparse(gml_file, events=('end',)):
+            if elem.tag == BLDG_BUILDING:
+                yield elem
+
+def release_element(elem):
+    """Clear a processed element and drop the already-parsed nodes before it."""
+    elem.clear()
+    if not HAVE_LXML:
+        # ElementTree has no parent links; clearing the element is all we can do
+        return
+    node = elem
+    parent = node.getparent()
+    while parent is not None:
+        while node.getprevious() is not None:
+            del parent[0]
+        node = parent
+        parent = node.getparent()
+
+def is_closing_point(first, last):
+    """True if last repeats first, allowing for floating-point wobble in the written coordinates."""
+    # Plain float arithmetic on two points is cheaper than any numpy comparison
+    dx = last[0] - first[0]
+    dy = last[1] - first[1]
+    dz = last[2] - first[2]
+    return dx * dx + dy * dy + dz * dz <= CLOSING_TOLERANCE * CLOSING_TOLERANCE
+
+def polygon_points(polygon):
+    """Return a gml:Polygon's exterior ring as an (M, 3) array, or None if unusable."""
+    # Direct child path covers schema-conformant posList rings
+    poslist = polygon.find(POLYGON_POSLIST_PATH)
+    if poslist is None:
+        # Get exterior ring
+        exterior = next(polygon.iter(GML_EXTERIOR), None)
+        if exterior is None:
+            return None
+        
+        # Get LinearRing
+        linear_ring = next(exterior.iter(GML_LINEAR_RING), None)
+        if linear_ring is None:
+            return None
+        
+        poslist = linear_ring.find(GML_POSLIST)
+    else:
+        linear_ring = None
+    
+    points = []
+    
+    # Try posList first (batch coordinates)
+    if poslist is not None and poslist.text:
+        # Parse the whole coordinate list in one C-level pass
+        coords = np.fromstring(poslist.text, dtype=np.float64, sep=' ')
+        if coords.size % 3:
+            return None
+        points = coords.reshape(-1, 3)
+    elif linear_ring is not None:
+        # Try individual pos elements, parsed together when each holds exactly 3 values
+        pos_texts = [pos.text for pos in linear_ring.findall(GML_POS) if pos.text]
+        coords = np.fromstring(' '.join(pos_texts), dtype=np.float64, sep=' ')
+        if coords.size == 3 * len(pos_texts):
+            points = coords.reshape(-1, 3)
+        else:
+            for text in pos_texts:
+                coords = list(map(float, text.split()))
+                if len(coords) >= 3:
+                    points.append((coords[0], coords[1], coords[2]))
+            points = np.array(points, dtype=np.float64)
+    
+    # GML rings repeat their first point at the end; keep each corner once
+    if len(points) > 1 and is_closing_point(points[0].tolist(), points[-1].tolist()):
+        points = points[:-1]
     
-    buildings_data = {}
+    if len(points) < 3:
+        return None
     
-    # Find all buildings
-    buildings = root.findall('.//bldg:Building', namespaces=ns)
-    print(f"Found {len(buildings)} buildings")
+    return points
+
+def collect_surface(elem, building_info, rings):
+    """Collect the exterior ring of every polygon in a semantic surface."""
+    surface_type = SURFACE_TAG_TYPES[elem.tag]
+    for polygon in elem.iter(GML_POLYGON):
+        points = polygon_points(polygon)
+        if points is None:
+            continue
+        
+        # Collect the ring; it is packed with the building's others later
+        rings.append(points)
+        building_info['surfaceTypes'][surface_type] += 1
+
+def set_description(elem, building_info, rings):
+    """Store the building description if found (and not already set)."""
+    if elem.text and not building_info['description']:
+        building_info['description'] = elem.text.strip()
+
+def numeric_attribute(key, convert):
+    """Build a handler storing a numeric building attribute if found (and not already set)."""
+    def set_attribute(elem, building_info, rings):
+        if elem.text and not building_info[key]:
+            try:
+                building_info[key] = convert(elem.text)
+            except ValueError:
+                pass
     
-    for building in buildings:
+    return set_attribute
+
+# Per-element handlers for the building walk, keyed by tag
+HANDLERS = {
+    **dict.fromkeys(SURFACE_TAG_TYPES, collect_surface),
+    GML_DESCRIPTION: set_description,
+    BLDG_MEASURED_HEIGHT: numeric_attribute('measuredHeight', float),
+    BLDG_STOREYS_ABOVE: numeric_attribute('storeysAboveGround', int),
+    BLDG_STOREYS_BELOW: numeric_attribute('storeysBelowGround', int)
+}
+
+def parse_buildings(source):
+    """Parse buildings from a CityGML file or file-like object; return (buildings_data, building_count)."""
+    buildings_data = {}
+    building_rings = defaultdict(list)
+    building_count = 0
+    
+    # Stream buildings one at a time instead of loading the whole DOM
+    for building in iter_buildings(source):
+        building_count += 1
+        
         # Get building ID
-        building_id = building.get('{http://www.opengis.net/gml}id')
+        building_id = building.get(GML_ID)
         if not building_id:
+            release_element(building)
             continue
         
         # Initialize or get existing building data
@@ -50,220 +242,401 @@ def parse_citygml(gml_file):
                 'measuredHeight': None,
                 'storeysAboveGround': None,
                 'storeysBelowGround': None,
-                'surfaces': []
+                'surfaceTypes': defaultdict(int)
             }
         
         building_info = buildings_data[building_id]
+        rings = building_rings[building_id]
         
-        # Update building attributes if found (and not already set)
-        desc_elem = building.find('.//gml:description', namespaces=ns)
-        if desc_elem is not None and desc_elem.text and not building_info['description']:
-            building_info['description'] = desc_elem.text.strip()
-        
-        height_elem = building.find('.//bldg:measuredHeight', namespaces=ns)
-        if height_elem is not None and height_elem.text and not building_info['measuredHeight']:
-            try:
-                building_info['measuredHeight'] = float(height_elem.text)
-            except ValueError:
-                pass
+        # Single walk over the building subtree: one dict lookup per element
+        for elem in building.iter():
+            handler = HANDLERS.get(elem.tag)
+            if handler is not None:
+                handler(elem, building_info, rings)
         
-        storeys_above = building.find('.//bldg:storeysAboveGround', namespaces=ns)
-        if storeys_above is not None and storeys_above.text and not building_info['storeysAboveGround']:
-            try:
-                building_info['storeysAboveGround'] = int(storeys_above.text)
-            except ValueError:
-                pass
-        
-        storeys_below = building.find('.//bldg:storeysBelowGround', namespaces=ns)
-        if storeys_below is not None and storeys_below.text and not building_info['storeysBelowGround']:
-            try:
-                building_info['storeysBelowGround'] = int(storeys_below.text)
-            except ValueError:
-                pass
-        
-        # Find all semantic surfaces within this building element
-        surface_types = [
-            ('bldg:RoofSurface', 'RoofSurface'),
-            ('bldg:WallSurface', 'WallSurface'),
-            ('bldg:GroundSurface', 'GroundSurface'),
-            ('bldg:ClosureSurface', 'ClosureSurface'),
-            ('bldg:FloorSurface', 'FloorSurface'),
-            ('bldg:CeilingSurface', 'CeilingSurface')
-        ]
+        # Free the processed subtree to keep memory flat
+        release_element(building)
+    
+    for building_id, building_info in buildings_data.items():
+        vertices, ring_offsets = pack_rings(building_rings[building_id])
+        building_info['vertices'] = vertices
+        building_info['ring_offsets'] = ring_offsets
+        building_info['triangles'] = triangulate_rings(vertices, ring_offsets)
+    
+    return buildings_data, building_count
+
+def pack_rings(rings):
+    """
+    Pack (M, 3) point arrays into one contiguous (N, 3) vertex array.
+    Returns (vertices, ring_offsets); ring i is vertices[ring_offsets[i]:ring_offsets[i + 1]].
+    """
+    ring_offsets = np.zeros(len(rings) + 1, dtype=np.intp)
+    ring_offsets[1:] = np.cumsum([len(ring) for ring in rings], dtype=np.intp)
+    vertices = np.concatenate(rings) if rings else np.empty((0, 3), dtype=np.float64)
+    
+    return vertices, ring_offsets
+
+def surface_count(building_info):
+    """Number of surface polygons collected for a building."""
+    return len(building_info['ring_offsets']) - 1
+
+def split_building_ranges(gml_file, workers):
+    """
+    Split a CityGML file into byte ranges on cityObjectMember boundaries.
+    Returns (head_end, tail_start, ranges), or None if the file can't be split.
+    """
+    with open(gml_file, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            root = CITY_MODEL_RE.search(mm)
+            tail_start = mm.rfind(b'</')
+            if root is None or tail_start < root.end():
+                return None
+            
+            # Chunks are wrapped in the head and tail, so CityModel must be the
+            # document root (not nested in another element) for them to parse
+            end_tag = re.compile(CITY_MODEL_END_RE % re.escape(root.group(1)))
+            if end_tag.match(mm[tail_start:]) is None:
+                return None
+            
+            # Cut at the first member starting after each even split point
+            cuts = [root.end()]
+            for i in range(1, workers):
+                target = max(cuts[-1] + 1, root.end() + (tail_start - root.end()) * i // workers)
+                member = CITY_OBJECT_MEMBER_RE.search(mm, target, tail_start)
+                if member is None:
+                    break
+                cuts.append(member.start())
+            cuts.append(tail_start)
+    
+    if len(cuts) < 3:
+        return None
+    
+    return root.end(), tail_start, list(zip(cuts[:-1], cuts[1:]))
+
+def parse_building_range(gml_file, head_end, tail_start, byte_range):
+    """Parse the buildings in one byte range, wrapped in the document's root tags."""
+    start, end = byte_range
+    with open(gml_file, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            document = mm[:head_end] + mm[start:end] + mm[tail_start:]
+    
+    try:
+        return parse_buildings(io.BytesIO(document))
+    except ET.ParseError as e:
+        # lxml parse errors don't pickle back to the parent process
+        raise ValueError(f"Could not parse chunk {start}-{end}: {e}") from None
+
+def merge_buildings(buildings_data, chunk_data):
+    """Merge buildings parsed from a later part of the file into buildings_data."""
+    for building_id, chunk_info in chunk_data.items():
+        building_info = buildings_data.get(building_id)
+        if building_info is None:
+            buildings_data[building_id] = chunk_info
+            continue
         
-        for surface_tag, surface_type in surface_types:
-            for surface_elem in building.findall('.//' + surface_tag, namespaces=ns):
-                # Find all polygons in this surface
-                for polygon in surface_elem.findall('.//gml:Polygon', namespaces=ns):
-                    # Get exterior ring
-                    exterior = polygon.find('.//gml:exterior', namespaces=ns)
-                    if exterior is None:
-                        continue
-                    
-                    # Get LinearRing
-                    linear_ring = exterior.find('.//gml:LinearRing', namespaces=ns)
-                    if linear_ring is None:
-                        continue
-                    
-                    points = []
-                    
-                    # Try posList first (batch coordinates)
-                    poslist = linear_ring.find('gml:posList', namespaces=ns)
-                    if poslist is not None and poslist.text:
-                        coords = list(map(float, poslist.text.split()))
-                        points = [(coords[i], coords[i+1], coords[i+2]) 
-                                 for i in range(0, len(coords), 3)]
-                    else:
-                        # Try individual pos elements
-                        pos_elements = linear_ring.findall('gml:pos', namespaces=ns)
-                        for pos in pos_elements:
-                            if pos.text:
-                                coords = list(map(float, pos.text.split()))
-                                if len(coords) >= 3:
-                                    points.append((coords[0], coords[1], coords[2]))
-                    
-                    if len(points) < 3:
-                        continue
-                    
-                    # Append surface to building's surfaces list
-                    building_info['surfaces'].append({
-                        'type': surface_type,
-                        'points': points
-                    })
+        # Same building ID seen earlier: keep attributes already set, add surfaces
+        for key in ('description', 'measuredHeight', 'storeysAboveGround', 'storeysBelowGround'):
+            if not building_info[key]:
+                building_info[key] = chunk_info[key]
+        building_info['ring_offsets'] = np.concatenate([
+            building_info['ring_offsets'],
+            chunk_info['ring_offsets'][1:] + len(building_info['vertices'])
+        ])
+        building_info['triangles'] = np.concatenate([
+            building_info['triangles'],
+            chunk_info['triangles'] + len(building_info['vertices'])
+        ])
+        building_info['vertices'] = np.concatenate([building_info['vertices'], chunk_info['vertices']])
+        for surface_type, count in chunk_info['surfaceTypes'].items():
+            building_info['surfaceTypes'][surface_type] += count
+
+def parse_file(gml_file):
+    """Parse a whole CityGML file in this process; return (buildings_data, building_count)."""
+    # Parse straight from a read-only mapping of the file so the OS pages
+    # it in on demand instead of copying it through stdio buffers
+    with open(gml_file, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return parse_buildings(mm)
+
+def parse_file_parallel(gml_file, split):
+    """Parse split byte ranges in worker processes; return (buildings_data, building_count)."""
+    # Buildings are independent: merge the ranges' results back in document order
+    head_end, tail_start, ranges = split
+    buildings_data = {}
+    building_count = 0
+    with ProcessPoolExecutor(max_workers=len(ranges)) as executor:
+        results = executor.map(parse_building_range, repeat(gml_file), repeat(head_end),
+                               repeat(tail_start), ranges)
+        for chunk_data, chunk_count in results:
+            merge_buildings(buildings_data, chunk_data)
+            building_count += chunk_count
+    
+    return buildings_data, building_count
+
+def parse_citygml(gml_file, workers=None):
+    """Parse CityGML and extract buildings with their surfaces grouped by Building ID."""
+    if workers is None:
+        workers = min(os.cpu_count() or 1, os.path.getsize(gml_file) // PARALLEL_CHUNK_BYTES)
+    
+    split = split_building_ranges(gml_file, workers) if workers > 1 else None
+    
+    if split is None:
+        buildings_data, building_count = parse_file(gml_file)
+    else:
+        print(f"Parsing in {len(split[2])} parallel chunks")
+        try:
+            buildings_data, building_count = parse_file_parallel(gml_file, split)
+        except ValueError as e:
+            # A serial parse either succeeds or reports the error at its real
+            # position in the file
+            print(f"Parallel parse failed ({e}); parsing serially")
+            buildings_data, building_count = parse_file(gml_file)
+    
+    print(f"Found {building_count} buildings")
     
     return buildings_data
 
 def calculate_offset(buildings_data):
     """Calculate minimum coordinates for centering."""
-    all_points = []
+    # Running minimum over per-building reductions; no global point array is built
+    min_point = np.full(3, np.inf)
     for building_info in buildings_data.values():
-        for surface in building_info['surfaces']:
-            all_points.extend(surface['points'])
+        if len(building_info['vertices']):
+            np.minimum(min_point, building_info['vertices'].min(axis=0), out=min_point)
     
-    if not all_points:
+    if not np.isfinite(min_point).all():
         return (0, 0, 0)
     
-    min_x = min(p[0] for p in all_points)
-    min_y = min(p[1] for p in all_points)
-    min_z = min(p[2] for p in all_points)
+    min_x, min_y, min_z = min_point.tolist()
     
     return (min_x, min_y, min_z)
 
-def triangulate_polygon(points):
-    """Simple triangle fan triangulation."""
-    if len(points) < 3:
-        return []
+def fan_triangles(ring_offsets):
+    """Simple triangle fan triangulation of every packed ring, returned as flat vertex indices."""
+    ring_starts = ring_offsets[:-1]
+    fan_sizes = np.diff(ring_offsets) - 2
+    
+    # Triangle k of a ring starting at s is (s, s + k + 1, s + k + 2)
+    first = np.repeat(ring_starts, fan_sizes)
+    fan_starts = np.cumsum(fan_sizes) - fan_sizes
+    k = np.arange(len(first)) - np.repeat(fan_starts, fan_sizes)
+    
+    fan = np.empty((len(first), 3), dtype=np.intp)
+    fan[:, 0] = first
+    fan[:, 1] = first + k + 1
+    fan[:, 2] = first + k + 2
+    
+    return fan.ravel()
+
+def ring_normals(vertices, ring_offsets):
+    """Newell normal (twice the vector area) of every packed ring, as an (S, 3) array."""
+    ring_starts = ring_offsets[:-1]
+    ring_sizes = np.diff(ring_offsets)
+    
+    # Work relative to each ring's first point to keep large coordinates precise
+    points = vertices - np.repeat(vertices[ring_starts], ring_sizes, axis=0)
     
-    triangles = []
-    for i in range(1, len(points) - 1):
-        triangles.append([points[0], points[i], points[i+1]])
+    # Pair every point with the next one in its ring, wrapping to the start
+    following = np.arange(1, len(vertices) + 1)
+    following[ring_offsets[1:] - 1] = ring_starts
+    next_points = points[following]
     
-    return triangles
+    terms = np.empty_like(points)
+    terms[:, 0] = (points[:, 1] - next_points[:, 1]) * (points[:, 2] + next_points[:, 2])
+    terms[:, 1] = (points[:, 2] - next_points[:, 2]) * (points[:, 0] + next_points[:, 0])
+    terms[:, 2] = (points[:, 0] - next_points[:, 0]) * (points[:, 1] + next_points[:, 1])
+    
+    return np.add.reduceat(terms, ring_starts, axis=0)
+
+def convex_rings(vertices, ring_offsets, normals):
+    """Mask of the packed rings whose corners all turn the same way as the ring normal."""
+    ring_starts = ring_offsets[:-1]
+    ring_ends = ring_offsets[1:] - 1
+    
+    # Neighbouring points within each ring, wrapping around
+    following = np.arange(1, len(vertices) + 1)
+    following[ring_ends] = ring_starts
+    preceding = np.arange(-1, len(vertices) - 1)
+    preceding[ring_starts] = ring_ends
+    
+    turns = np.cross(vertices - vertices[preceding], vertices[following] - vertices)
+    alignment = (turns * np.repeat(normals, np.diff(ring_offsets), axis=0)).sum(axis=1)
+    return np.minimum.reduceat(alignment, ring_starts) >= 0
+
+def ear_winding(ring, ears):
+    """Twice the signed area of the first non-degenerate ear; all ears of a ring share one winding."""
+    # Plain float arithmetic: a handful of scalars is far cheaper than numpy temporaries
+    for ear in ears.tolist():
+        (ax, ay), (bx, by), (cx, cy) = ring[ear].tolist()
+        cross = (bx - ax) * (cy - ay) - (by - ay) * (cx - ax)
+        if cross:
+            return cross
+    return 0.0
+
+def earcut_triangles(vertices, ring_offsets):
+    """Triangulate every packed ring, ear clipping only the concave ones; returned as flat vertex indices."""
+    normals = ring_normals(vertices, ring_offsets)
+    convex = convex_rings(vertices, ring_offsets, normals)
+    
+    # Fans are exact for convex rings, which most building surfaces are
+    fans = fan_triangles(ring_offsets).reshape(-1, 3)
+    triangles = [fans[np.repeat(convex, np.diff(ring_offsets) - 2)].ravel()]
+    
+    concave = np.flatnonzero(~convex)
+    concave_normals = normals[concave]
+    dominant_axes = np.abs(concave_normals).argmax(axis=1)
+    for start, end, axis, normal in zip(ring_offsets[concave].tolist(), ring_offsets[concave + 1].tolist(),
+                                        dominant_axes.tolist(), concave_normals.tolist()):
+        # Project onto the coordinate plane the ring is most parallel to
+        plane_axes = PROJECTION_AXES[axis]
+        ring = vertices[start:end, plane_axes] - vertices[start, plane_axes]
+        ears = mapbox_earcut.triangulate_float64(ring, np.array([end - start], dtype=np.uint32))
+        ears = ears.astype(np.intp).reshape(-1, 3)
+        if not len(ears):
+            continue
+        
+        # earcut picks its own winding; match the ring's so faces keep their orientation
+        if ear_winding(ring, ears) * normal[axis] < 0:
+            ears = ears[:, ::-1]
+        triangles.append(ears.ravel() + start)
+    
+    return np.concatenate(triangles)
+
+def triangulate_rings(vertices, ring_offsets):
+    """Triangulate every packed ring: earcut for concave rings when mapbox_earcut is installed, fans otherwise."""
+    if mapbox_earcut is None or len(ring_offsets) < 2:
+        return fan_triangles(ring_offsets)
+    return earcut_triangles(vertices, ring_offsets)
+
+def dump_json(obj, indent=False):
+    """Serialize obj to UTF-8 JSON bytes, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    if indent:
+        return json.dumps(obj, indent=2).encode('utf-8')
+    return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+
+def align4(byte_count):
+    """Round a byte count up to the next 4-byte boundary."""
+    return byte_count + (-byte_count & 3)
+
+def quantize(local_points, center, step):
+    """Map offset coordinates onto a building's int16 grid."""
+    return np.rint((local_points - center) / step).astype(np.int16)
+
+def index_type(vertex_count):
+    """Narrowest glTF index type for a mesh, as (numpy dtype, componentType)."""
+    # The largest value of each type is reserved (primitive restart), so a
+    # uint16 index can address at most 0xFFFF vertices
+    if vertex_count <= 0xFFFF:
+        return np.uint16, 5123  # UNSIGNED_SHORT
+    return np.uint32, 5125  # UNSIGNED_INT
+
+def building_points(building_info, offset):
+    """Return a building's vertices minus offset and their triangulation."""
+    return building_info['vertices'] - offset, building_info['triangles']
+
+def weld_vertices(local_points, center, step):
+    """
+    Quantize points onto a building's int16 grid, merging points that share a grid position.
+    Returns (grid_vertices, inverse) with grid_vertices[inverse] equal to the quantized points.
+    """
+    grid_points = quantize(local_points, center, step)
+    
+    # Pack each int16 triple into one int64 key so a 1-D unique does the merge
+    shifted = grid_points.astype(np.int64) + 0x8000
+    keys = (shifted[:, 0] << 32) | (shifted[:, 1] << 16) | shifted[:, 2]
+    _, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+    
+    return grid_points[first], inverse
+
+def building_mesh(building_info, layout, offset):
+    """Triangulate one building into indexed (vertices, indices) arrays."""
+    _, _, center, step = layout
+    local_points, fan_indices = building_points(building_info, offset)
+    
+    # Share vertices between triangles and surfaces: one entry per grid position
+    grid_vertices, inverse = weld_vertices(local_points, center, step)
+    
+    # The fourth int16 column pads each vertex to the 4-byte alignment
+    # glTF requires for attributes
+    vertices_array = np.zeros((len(grid_vertices), 4), dtype=np.int16)
+    vertices_array[:, :3] = grid_vertices
+    index_dtype, _ = index_type(len(grid_vertices))
+    indices_array = inverse.reshape(-1)[fan_indices].astype(index_dtype)
+    
+    return vertices_array, indices_array
 
 def create_glb(buildings_data, output_path, offset):
     """Create GLB file with one mesh per building (all surfaces combined)."""
     
     print(f"Creating GLB with {len(buildings_data)} building meshes")
     
+    offset = np.array(offset, dtype=np.float64)
+    
+    nodes = []
     meshes = []
     accessors = []
-    buffer_views = []
-    buffers_data = []
+    mesh_layouts = {}
     
-    current_byte_offset = 0
+    vertex_byte_offset = 0
+    index_byte_offset = 0
     
-    # Create one mesh per building
+    # Sizing pass: lay out every accessor without keeping any geometry;
+    # meshes are rebuilt one at a time while the BIN chunk is written
     for building_id, building_info in buildings_data.items():
-        if not building_info['surfaces']:
+        index_count = len(building_info['triangles'])
+        if not index_count:
             continue
         
-        # Collect all vertices and indices for this building
-        all_vertices = []
-        all_indices = []
-        vertex_offset = 0
-        
-        for surface in building_info['surfaces']:
-            # Apply offset
-            offset_points = [(p[0] - offset[0], p[1] - offset[1], p[2] - offset[2]) 
-                            for p in surface['points']]
-            
-            # Triangulate
-            triangles = triangulate_polygon(offset_points)
-            
-            for tri in triangles:
-                for vert in tri:
-                    all_vertices.extend(vert)
-                
-                # Add indices
-                for i in range(3):
-                    all_indices.append(vertex_offset + i)
-                vertex_offset += 3
-        
-        if not all_vertices:
-            continue
+        # Vertices are the polygon points welded on the grid, so their
+        # bounds are exactly the quantized bounds of the points
+        local_points = building_info['vertices'] - offset
+        lo = local_points.min(axis=0)
+        hi = local_points.max(axis=0)
         
-        # Convert to numpy arrays
-        vertices_array = np.array(all_vertices, dtype=np.float32)
-        indices_array = np.array(all_indices, dtype=np.uint32)
+        # Quantize positions to a uniform int16 grid centred on the building
+        # (KHR_mesh_quantization); the node transform restores metres
+        center = (lo + hi) / 2
+        step = float((hi - lo).max()) / (2 * QUANTIZED_MAX) or 1.0
+        vertex_count = len(weld_vertices(local_points, center, step)[0])
+        mesh_layouts[building_id] = (vertex_byte_offset, index_byte_offset, center, step)
+        grid_bounds = quantize(np.stack([lo, hi]), center, step)
         
-        # Create buffer views and accessors
+        # Every building's accessors point into the two shared buffer views
         # Vertices
-        vertex_buffer = vertices_array.tobytes()
-        vertex_buffer_view_idx = len(buffer_views)
-        buffer_views.append({
-            'buffer': 0,
-            'byteOffset': current_byte_offset,
-            'byteLength': len(vertex_buffer),
-            'target': 34962  # ARRAY_BUFFER
-        })
-        buffers_data.append(vertex_buffer)
-        current_byte_offset += len(vertex_buffer)
-        
-        # Pad to 4-byte boundary
-        padding = (4 - (current_byte_offset % 4)) % 4
-        if padding:
-            buffers_data.append(b'\x00' * padding)
-            current_byte_offset += padding
-        
         vertex_accessor_idx = len(accessors)
         accessors.append({
-            'bufferView': vertex_buffer_view_idx,
-            'byteOffset': 0,
-            'componentType': 5126,  # FLOAT
-            'count': len(all_vertices) // 3,
+            'bufferView': 0,
+            'byteOffset': vertex_byte_offset,
+            'componentType': 5122,  # SHORT
+            'count': vertex_count,
             'type': 'VEC3',
-            'min': [float(min(all_vertices[i::3])) for i in range(3)],
-            'max': [float(max(all_vertices[i::3])) for i in range(3)]
+            'min': grid_bounds[0].tolist(),
+            'max': grid_bounds[1].tolist()
         })
+        vertex_byte_offset += vertex_count * 8
         
-        # Indices
-        index_buffer = indices_array.tobytes()
-        index_buffer_view_idx = len(buffer_views)
-        buffer_views.append({
-            'buffer': 0,
-            'byteOffset': current_byte_offset,
-            'byteLength': len(index_buffer),
-            'target': 34963  # ELEMENT_ARRAY_BUFFER
-        })
-        buffers_data.append(index_buffer)
-        current_byte_offset += len(index_buffer)
-        
-        # Pad to 4-byte boundary
-        padding = (4 - (current_byte_offset % 4)) % 4
-        if padding:
-            buffers_data.append(b'\x00' * padding)
-            current_byte_offset += padding
-        
+        # Indices; each run starts on a 4-byte boundary so uint16 and uint32
+        # runs can share one buffer view
+        index_dtype, index_component_type = index_type(vertex_count)
         index_accessor_idx = len(accessors)
         accessors.append({
-            'bufferView': index_buffer_view_idx,
-            'byteOffset': 0,
-            'componentType': 5125,  # UNSIGNED_INT
-            'count': len(all_indices),
+            'bufferView': 1,
+            'byteOffset': index_byte_offset,
+            'componentType': index_component_type,
+            'count': index_count,
             'type': 'SCALAR'
         })
+        index_byte_offset = align4(index_byte_offset + index_count * np.dtype(index_dtype).itemsize)
         
         # Create mesh with building ID as name
+        nodes.append({
+            'mesh': len(meshes),
+            'name': building_id,
+            'translation': center.tolist(),
+            'scale': [step, step, step]
+        })
         meshes.append({
             'name': building_id,  # CRITICAL: Building ID as mesh name
             'primitives': [{
@@ -275,8 +648,25 @@ def create_glb(buildings_data, output_path, offset):
             }]
         })
     
-    # Combine all buffer data
-    combined_buffer = b''.join(buffers_data)
+    # One buffer view for all vertices followed by one for all indices
+    # (vertex runs are 8 bytes per vertex, so the index view stays aligned)
+    vertex_view_length = vertex_byte_offset
+    binary_length = vertex_view_length + index_byte_offset
+    buffer_views = [
+        {
+            'buffer': 0,
+            'byteOffset': 0,
+            'byteLength': vertex_view_length,
+            'byteStride': 8,
+            'target': 34962  # ARRAY_BUFFER
+        },
+        {
+            'buffer': 0,
+            'byteOffset': vertex_view_length,
+            'byteLength': index_byte_offset,
+            'target': 34963  # ELEMENT_ARRAY_BUFFER
+        }
+    ]
     
     # Create JSON structure
     gltf_json = {
@@ -284,40 +674,46 @@ def create_glb(buildings_data, output_path, offset):
             'version': '2.0',
             'generator': 'CityGML2GLB Converter v2'
         },
+        'extensionsUsed': ['KHR_mesh_quantization'],
+        'extensionsRequired': ['KHR_mesh_quantization'],
         'scene': 0,
         'scenes': [{
-            'nodes': list(range(len(meshes)))
+            'nodes': list(range(len(nodes)))
         }],
-        'nodes': [{'mesh': i, 'name': meshes[i]['name']} for i in range(len(meshes))],
+        'nodes': nodes,
         'meshes': meshes,
         'accessors': accessors,
         'bufferViews': buffer_views,
         'buffers': [{
-            'byteLength': len(combined_buffer)
+            'byteLength': binary_length
         }]
     }
     
+    def binary_chunks():
+        # Geometry is built one building at a time; its vertices and indices
+        # land at their own offsets in the two buffer views
+        for building_id, layout in mesh_layouts.items():
+            vertices_array, indices_array = building_mesh(buildings_data[building_id], layout, offset)
+            yield layout[0], vertices_array
+            yield vertex_view_length + layout[1], indices_array
+    
     # Write GLB file
-    write_glb(output_path, gltf_json, combined_buffer)
+    write_glb(output_path, gltf_json, binary_length, binary_chunks())
     print(f"Wrote GLB to {output_path}")
 
-def write_glb(output_path, gltf_json, binary_buffer):
-    """Write GLB file (binary GLTF)."""
+def write_glb(output_path, gltf_json, binary_length, binary_chunks):
+    """Write GLB file (binary GLTF), streaming (byte offset, array) pairs into the BIN chunk."""
     # Convert JSON to bytes
-    json_bytes = json.dumps(gltf_json, separators=(',', ':')).encode('utf-8')
+    json_bytes = dump_json(gltf_json)
     
     # Pad JSON to 4-byte boundary
     json_padding = (4 - (len(json_bytes) % 4)) % 4
     json_bytes += b' ' * json_padding
     
-    # Pad binary to 4-byte boundary
-    bin_padding = (4 - (len(binary_buffer) % 4)) % 4
-    binary_buffer += b'\x00' * bin_padding
-    
     # GLB header
     magic = 0x46546C67  # 'glTF'
     version = 2
-    total_length = 12 + 8 + len(json_bytes) + 8 + len(binary_buffer)
+    total_length = 12 + 8 + len(json_bytes) + 8 + binary_length
     
     with open(output_path, 'wb') as f:
         # Header
@@ -328,10 +724,18 @@ def write_glb(output_path, gltf_json, binary_buffer):
         f.write(struct.pack('<I', 0x4E4F534A))  # 'JSON'
         f.write(json_bytes)
         
-        # Binary chunk
-        f.write(struct.pack('<I', len(binary_buffer)))
+        # Binary chunk, sized up front so alignment gaps read back as zeros;
+        # each array is written straight from its buffer at its offset
+        f.write(struct.pack('<I', binary_length))
         f.write(struct.pack('<I', 0x004E4942))  # 'BIN\0'
-        f.write(binary_buffer)
+        binary_start = f.tell()
+        f.truncate(total_length)
+        for byte_offset, array in binary_chunks:
+            view = memoryview(array).cast('B')
+            if byte_offset + view.nbytes > binary_length:
+                raise ValueError(f"Binary chunk overflow: {byte_offset + view.nbytes} of {binary_length} bytes")
+            f.seek(binary_start + byte_offset)
+            f.write(view)
 
 def write_metadata(buildings_data, metadata_file, offset):
     """Write metadata JSON compatible with viewer."""
@@ -345,62 +749,49 @@ def write_metadata(buildings_data, metadata_file, offset):
         'objects': {}
     }
     
-    # Create metadata for each building
+    # Create metadata for each building; every key is set by the parser, so
+    # values are read directly and surfaceTypes is serialized without a copy
+    objects = metadata['objects']
     for building_id, building_info in buildings_data.items():
-        # Count surfaces by type
-        surface_types = defaultdict(int)
-        for surface in building_info['surfaces']:
-            surface_types[surface['type']] += 1
-        
-        metadata['objects'][building_id] = {
+        objects[building_id] = {
             'element_type': 'Building',
-            'polygon_count': len(building_info['surfaces']),
+            'polygon_count': surface_count(building_info),
             'metadata': {
                 'name': building_id,
-                'description': building_info.get('description', f"{building_id}, created from CityGML"),
-                'measuredHeight': building_info.get('measuredHeight'),
-                'storeysAboveGround': building_info.get('storeysAboveGround'),
-                'storeysBelowGround': building_info.get('storeysBelowGround'),
-                'surfaceTypes': dict(surface_types)
+                'description': building_info['description'],
+                'measuredHeight': building_info['measuredHeight'],
+                'storeysAboveGround': building_info['storeysAboveGround'],
+                'storeysBelowGround': building_info['storeysBelowGround'],
+                'surfaceTypes': building_info['surfaceTypes']
             }
         }
     
-    with open(metadata_file, 'w') as f:
-        json.dump(metadata, f, indent=2)
+    with open(metadata_file, 'wb') as f:
+        f.write(dump_json(metadata, indent=True))
     
     print(f"Wrote metadata to {metadata_file}")
 
-def main():
-    if len(sys.argv) < 2:
-        print("Usage: python gml2glb.py <input.gml> [output.glb]")
-        sys.exit(1)
-    
-    gml_file = sys.argv[1]
-    
-    if len(sys.argv) >= 3:
-        output_file = sys.argv[2]
-    else:
-        base_name = Path(gml_file).stem
-        output_file = f"{base_name}.glb"
-    
+def convert_file(gml_file, output_file, workers=None):
+    """
+    Convert a CityGML file to GLB plus metadata JSON next to it.
+    Returns the metadata file path; raises ValueError if there is nothing to convert.
+    """
     metadata_file = output_file.replace('.glb', '_metadata.json')
     
     print(f"Converting {gml_file} to GLB...")
-    buildings_data = parse_citygml(gml_file)
+    buildings_data = parse_citygml(gml_file, workers)
     
     if not buildings_data:
-        print("No buildings found!")
-        sys.exit(1)
+        raise ValueError("No buildings found!")
     
     print(f"Parsed {len(buildings_data)} buildings")
     
     # Check total surfaces
-    total_surfaces = sum(len(b['surfaces']) for b in buildings_data.values())
+    total_surfaces = sum(surface_count(b) for b in buildings_data.values())
     print(f"Total surfaces: {total_surfaces}")
     
     if total_surfaces == 0:
-        print("No surfaces found in buildings!")
-        sys.exit(1)
+        raise ValueError("No surfaces found in buildings!")
     
     offset = calculate_offset(buildings_data)
     print(f"Offset: {offset}")
@@ -408,6 +799,64 @@ def main():
     create_glb(buildings_data, output_file, offset)
     write_metadata(buildings_data, metadata_file, offset)
     
+    return metadata_file
+
+def convert_batch_file(gml_file, output_file):
+    """Convert one file of a batch in this worker; return an error message or None."""
+    try:
+        # The batch is already spread over processes, so parse serially
+        convert_file(gml_file, output_file, workers=1)
+    except Exception as e:
+        return str(e)
+    return None
+
+def convert_batch(pattern, output_dir):
+    """Convert every file matching a glob pattern, one file per worker process; return the failure count."""
+    gml_files = sorted(glob.glob(pattern))
+    if not gml_files:
+        print(f"No files match {pattern}")
+        return 1
+    
+    Path(output_dir).mkdir(parents=True, exist_ok=True)
+    output_files = [str(Path(output_dir) / f"{Path(gml_file).stem}.glb") for gml_file in gml_files]
+    
+    failures = 0
+    with ProcessPoolExecutor(max_workers=min(os.cpu_count() or 1, len(gml_files))) as executor:
+        errors = executor.map(convert_batch_file, gml_files, output_files)
+        for gml_file, output_file, error in zip(gml_files, output_files, errors):
+            if error:
+                print(f"❌ {gml_file}: {error}")
+                failures += 1
+            else:
+                print(f"✅ {gml_file} -> {output_file}")
+    
+    print(f"Converted {len(gml_files) - failures} of {len(gml_files)} files")
+    return failures
+
+def main():
+    if len(sys.argv) < 2 or (sys.argv[1] == '--batch' and len(sys.argv) < 3):
+        print("Usage: python gml2glb.py <input.gml> [output.glb]")
+        print("       python gml2glb.py --batch '<pattern>' [output_dir]")
+        sys.exit(1)
+    
+    if sys.argv[1] == '--batch':
+        output_dir = sys.argv[3] if len(sys.argv) >= 4 else '.'
+        sys.exit(1 if convert_batch(sys.argv[2], output_dir) else 0)
+    
+    gml_file = sys.argv[1]
+    
+    if len(sys.argv) >= 3:
+        output_file = sys.argv[2]
+    else:
+        base_name = Path(gml_file).stem
+        output_file = f"{base_name}.glb"
+    
+    try:
+        metadata_file = convert_file(gml_file, output_file)
+    except ValueError as e:
+        print(e)
+        sys.exit(1)
+    
     print(f"✅ Done! Created {output_file} and {metadata_file}")
 
 if __name__ == "__main__":
@@ -8,13 +8,13 @@ eval "$(conda shell.bash hook)"
 conda activate citygml-view
 
 # Install dependencies
-pip install flask flask-cors
+pip install flask flask-cors gunicorn
 
 echo ""
 echo "Setup complete!"
 echo ""
 echo "To run the server:"
 echo "  1. Activate conda environment: conda activate citygml-view"
-echo "  2. Run server: python3 server.py"
+echo "  2. Run server: ./scripts/start_server.sh"
 echo ""
 echo "To deactivate when done: conda deactivate"
@@ -7,4 +7,15 @@ echo ""
 # Activate conda environment and start server
 eval "$(conda shell.bash hook)"
 conda activate citygml-view
-python server.py
+
+# Sessions and conversion jobs live in the server process, so run a single
+# worker; threads serve requests concurrently and conversions use a process pool
+THREADS=${THREADS:-8}
+
+# Keep gunicorn's heartbeat file in memory where /dev/shm exists (not on macOS)
+TMP_ARGS=()
+if [ -d /dev/shm ]; then
+    TMP_ARGS=(--worker-tmp-dir /dev/shm)
+fi
+
+gunicorn -w 1 -k gthread --threads "$THREADS" -b 0.0.0.0:5001 "${TMP_ARGS[@]}" wsgi:app
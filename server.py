@@ -4,29 +4,182 @@ CityGML Conversion Server
 Handles file uploads, automatic conversion to GLB, and temporary file management
 """
 
-from flask import Flask, request, jsonify, send_from_directory, send_file
+from flask import Flask, Request, request, jsonify, send_from_directory, send_file
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
+from werkzeug.exceptions import RequestEntityTooLarge
+from werkzeug.utils import secure_filename
+import atexit
+import logging
+import logging.handlers
+import multiprocessing
 import os
+import queue
 import sys
 import json
 import tempfile
 import shutil
-import subprocess
+import threading
+import time
 import uuid
+from collections import OrderedDict
+from concurrent.futures.process import BrokenProcessPool
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed, TimeoutError as ConversionTimeout
+from functools import partial
 from pathlib import Path
 from datetime import datetime
 
+from conversion import LOG_FORMAT, init_worker_logging, run_conversion
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Content hash for the conversion cache: BLAKE3 when installed, else BLAKE2b
+try:
+    from blake3 import blake3 as content_hasher
+except ImportError:
+    from hashlib import blake2b as content_hasher
+
+# Request threads only enqueue log records; a listener thread, started with
+# the other background threads, writes them out
+logger = logging.getLogger("server")
+logger.setLevel(logging.INFO)
+logger.propagate = False
+log_queue = queue.Queue(-1)
+log_handler = logging.StreamHandler(sys.stdout)
+log_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+log_listener = logging.handlers.QueueListener(log_queue, log_handler)
+logger.addHandler(logging.handlers.QueueHandler(log_queue))
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson, keeping Flask's sorted keys and default conversions"""
+    
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default, option=orjson.OPT_SORT_KEYS).decode('utf-8')
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+class UploadSpool:
+    """Uploaded file written straight into UPLOAD_DIR and hashed as it arrives"""
+    
+    def __init__(self):
+        fd, self.name = tempfile.mkstemp(dir=UPLOAD_DIR, prefix='.upload_')
+        self.file = open(fd, 'w+b', buffering=UPLOAD_BUFFER_SIZE)
+        self.hasher = content_hasher()
+        self.persisted = False
+    
+    def __getattr__(self, name):
+        return getattr(self.file, name)
+    
+    def write(self, data):
+        self.hasher.update(data)
+        return self.file.write(data)
+    
+    def persist(self, path):
+        """Close the spool and move it to path without copying"""
+        self.file.close()
+        os.replace(self.name, path)
+        self.persisted = True
+    
+    def close(self):
+        """Close the spool, deleting it unless it was persisted"""
+        self.file.close()
+        if not self.persisted:
+            Path(self.name).unlink(missing_ok=True)
+
+class UploadRequest(Request):
+    """Request that spools uploaded files into UPLOAD_DIR instead of temporary files"""
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.upload_spools = []
+    
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        spool = UploadSpool()
+        self.upload_spools.append(spool)
+        return spool
+    
+    def close(self):
+        # Also drops spools of uploads that were aborted mid-parse
+        super().close()
+        for spool in self.upload_spools:
+            spool.close()
+
 app = Flask(__name__)
+app.request_class = UploadRequest
 CORS(app)  # Enable CORS for local development
 
+# Faster JSON responses when orjson is installed
+if orjson is not None:
+    app.json = OrjsonProvider(app)
+
 # Configuration
 TEMP_DIR = Path("temp_models")
 UPLOAD_DIR = Path("uploads")
+CACHE_DIR = Path("model_cache")
 TEMP_DIR.mkdir(exist_ok=True)
 UPLOAD_DIR.mkdir(exist_ok=True)
+CACHE_DIR.mkdir(exist_ok=True)
+
+# Store active conversions, oldest first; guarded by sessions_lock
+active_models = OrderedDict()
+sessions_lock = threading.Lock()
+
+# Sessions beyond MAX_SESSIONS evict the least recently used one; sessions
+# older than SESSION_TTL seconds are evicted every EVICTION_INTERVAL seconds
+MAX_SESSIONS = 100
+SESSION_TTL = 3600
+EVICTION_INTERVAL = 300
 
-# Store active conversions
-active_models = {}
+# Conversions run in worker processes so uploads return immediately;
+# pending futures are kept apart from active_models, which is served as JSON.
+# A worker that dies (e.g. killed for memory) breaks the pool, so
+# submit_conversion replaces it
+
+def start_conversion_pool():
+    """
+    Create the conversion worker pool.
+    Workers are started by a forkserver (spawned where that is unavailable) rather
+    than forked from this process, whose request and logging threads may hold locks.
+    """
+    start_method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+    mp_context = multiprocessing.get_context(start_method)
+    if start_method == 'forkserver':
+        # Preload the side-effect-free job module instead of this script
+        mp_context.set_forkserver_preload(['conversion'])
+    return ProcessPoolExecutor(max_workers=os.cpu_count(), mp_context=mp_context,
+                               initializer=init_worker_logging)
+
+executor = start_conversion_pool()
+conversion_jobs = {}
+
+# Conversions in progress by content hash, so identical uploads share one;
+# guarded by sessions_lock. Each job reads its own link to the upload,
+# CACHE_DIR/<hash>.gml, so evicting the uploading session cannot break it
+cache_jobs = {}
+
+# Longest an upload with ?wait=1 blocks before answering (seconds)
+CONVERSION_TIMEOUT = 300
+
+# Served model files: content types unknown to mimetypes, and cache lifetime (seconds)
+MODEL_MIMETYPES = {'.glb': 'model/gltf-binary'}
+MODEL_MAX_AGE = 3600
+
+# Write buffer size for uploads spooled to disk
+UPLOAD_BUFFER_SIZE = 1024 * 1024
+
+# Longest sanitized upload name kept in the stored file name
+MAX_FILENAME_LENGTH = 200
+
+# Threads deleting session files in parallel for /cleanup-all
+CLEANUP_WORKERS = 16
+
+# Largest accepted upload (bytes); bigger requests are answered with 413
+MAX_UPLOAD_SIZE = int(os.environ.get('MAX_UPLOAD_SIZE', 2 * 1024 ** 3))
+app.config['MAX_CONTENT_LENGTH'] = MAX_UPLOAD_SIZE
 
 @app.route('/api', methods=['GET'])
 def swagger_ui():
@@ -67,9 +220,14 @@ def upload_gml():
             return jsonify({"error": "Empty filename"}), 400
         
         # Validate file extension
-        if not file.filename.lower().endswith(('.gml', '.xml')):
+        extension = Path(file.filename).suffix.lower()
+        if extension not in ('.gml', '.xml'):
             return jsonify({"error": "Invalid file type. Only .gml and .xml files are allowed"}), 400
         
+        # Never use the client's name as a path: keep a sanitized, bounded stem
+        # (which may be empty for non-ASCII names) and the validated extension
+        safe_stem = secure_filename(Path(file.filename).stem)[:MAX_FILENAME_LENGTH] or "upload"
+        
         # Generate unique session ID
         session_id = str(uuid.uuid4())
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -78,104 +236,271 @@ def upload_gml():
         session_dir = TEMP_DIR / session_id
         session_dir.mkdir(exist_ok=True)
         
-        # Save uploaded file
-        gml_path = UPLOAD_DIR / f"{session_id}_{file.filename}"
-        file.save(gml_path)
-        
-        print(f"[{timestamp}] Uploaded: {file.filename} (Session: {session_id})")
+        # The upload was spooled into UPLOAD_DIR and hashed while the request
+        # was parsed; moving it into place avoids a second copy
+        gml_path = UPLOAD_DIR / f"{session_id}_{safe_stem}{extension}"
+        file.stream.persist(gml_path)
+        cache_dir = CACHE_DIR / file.stream.hasher.hexdigest()
         
-        # Run conversion
-        print(f"[{timestamp}] Starting conversion...")
-        success, message = run_conversion(gml_path, session_dir, session_id)
+        logger.info("[%s] Uploaded: %s (Session: %s)", timestamp, file.filename, session_id)
         
-        if not success:
-            # Cleanup on failure
-            shutil.rmtree(session_dir, ignore_errors=True)
-            gml_path.unlink(missing_ok=True)
-            return jsonify({"error": message}), 500
-        
-        # Store session info
-        active_models[session_id] = {
+        # Store session info, evicting the least recently used sessions over the cap
+        session_info = {
             "filename": file.filename,
             "created": timestamp,
+            "created_ts": time.time(),
             "gml_path": str(gml_path),
-            "session_dir": str(session_dir)
+            "session_dir": str(session_dir),
+            "cache_dir": str(cache_dir),
+            "status": "queued"
         }
+        with sessions_lock:
+            active_models[session_id] = session_info
+            overflow = list(active_models)[:-MAX_SESSIONS]
+        for evicted_id in overflow:
+            evict_session(evicted_id)
+            logger.info("[%s] Evicted session: %s", timestamp, evicted_id)
+        
+        # Identical content converts once: reuse the cached model, join a
+        # conversion already in progress, or queue one in the worker pool
+        with sessions_lock:
+            cached = (cache_dir / "model_metadata.json").exists()
+            if cached:
+                # Link before releasing the lock, so eviction can't move the
+                # cached files away in between; a failed link means reconvert
+                try:
+                    link_cached_model(cache_dir, session_dir)
+                except OSError:
+                    cached = False
+            future = None if cached else cache_jobs.get(cache_dir.name)
+            started = not cached and future is None
+            if started:
+                logger.info("[%s] Starting conversion...", timestamp)
+                job_input = cache_job_input(cache_dir.name)
+                link_file(gml_path, job_input)
+                future = submit_conversion(job_input, cache_dir, session_id)
+                cache_jobs[cache_dir.name] = future
+        
+        # Outside the lock: a future that is already done (e.g. its pool broke)
+        # runs the callback right here, and finish_cache_job takes the lock
+        if started:
+            future.add_done_callback(partial(finish_cache_job, cache_dir.name))
+        
+        if cached:
+            session_info["status"] = "done"
+            logger.info("[%s] Reused cached conversion %s", timestamp, cache_dir.name)
+            return jsonify({
+                "session_id": session_id,
+                "filename": file.filename,
+                "status": "done",
+                "message": "Conversion successful (cached)",
+                "files": session_files(session_id)
+            }), 200
+        
+        conversion_jobs[session_id] = future
+        future.add_done_callback(partial(finish_conversion, session_id))
+        
+        # ?wait=1 keeps the original blocking behaviour
+        if request.args.get('wait') == '1':
+            try:
+                success, message = future.result(timeout=CONVERSION_TIMEOUT)
+            except ConversionTimeout:
+                # The conversion keeps running and can still be polled
+                return jsonify({
+                    "error": "Conversion timeout (exceeded 5 minutes)",
+                    "session_id": session_id,
+                    "status_url": f"/status/{session_id}"
+                }), 500
+            
+            if not success:
+                # Cleanup on failure
+                evict_session(session_id)
+                return jsonify({"error": message}), 500
+            
+            link_cached_model(cache_dir, session_dir)
+            return jsonify({
+                "session_id": session_id,
+                "filename": file.filename,
+                "message": "Conversion successful",
+                "files": session_files(session_id)
+            }), 200
         
-        print(f"[{timestamp}] Conversion successful!")
         return jsonify({
             "session_id": session_id,
             "filename": file.filename,
-            "message": "Conversion successful",
-            "files": {
-                "glb": f"/models/{session_id}/model.glb",
-                "metadata": f"/models/{session_id}/model_metadata.json"
-            }
-        }), 200
-        
+            "status": "queued",
+            "message": "Conversion started",
+            "status_url": f"/status/{session_id}",
+            "files": session_files(session_id)
+        }), 202
+        
+    except RequestEntityTooLarge:
+        return jsonify({"error": f"File too large. Maximum upload size is {MAX_UPLOAD_SIZE} bytes"}), 413
     except Exception as e:
-        print(f"Error during upload: {str(e)}")
+        logger.error("Error during upload: %s", e)
         return jsonify({"error": f"Upload failed: {str(e)}"}), 500
 
-def run_conversion(gml_path, output_dir, session_id):
+def session_files(session_id):
+    """URLs of a session's converted files"""
+    return {
+        "glb": f"/models/{session_id}/model.glb",
+        "metadata": f"/models/{session_id}/model_metadata.json"
+    }
+
+def evict_session(session_id):
+    """
+    Forget a session and delete its files.
+    Returns False if the session does not exist.
+    """
+    with sessions_lock:
+        session_info = active_models.pop(session_id, None)
+    if session_info is None:
+        return False
+    
+    # A conversion still in progress keeps running: its result fills the cache
+    conversion_jobs.pop(session_id, None)
+    
+    shutil.rmtree(session_info["session_dir"], ignore_errors=True)
+    Path(session_info["gml_path"]).unlink(missing_ok=True)
+    return True
+
+def evict_expired_sessions():
+    """Background loop evicting expired sessions and cached conversions; errors are logged, never fatal"""
+    while True:
+        time.sleep(EVICTION_INTERVAL)
+        try:
+            evict_expired()
+        except Exception:
+            logger.exception("Eviction pass failed")
+
+def evict_expired():
+    """Evict sessions older than SESSION_TTL and cached conversions unused for as long"""
+    now = time.time()
+    with sessions_lock:
+        expired = [session_id for session_id, session_info in active_models.items()
+                   if now - session_info["created_ts"] > SESSION_TTL]
+    for session_id in expired:
+        evict_session(session_id)
+        logger.info("Expired session: %s", session_id)
+    
+    # Drop cached conversions that no session has linked for SESSION_TTL
+    # (unlinking a session's copy updates the cached file's ctime). Under the
+    # lock they are only renamed out of the way, so uploads stop using them;
+    # the slow deletion happens after it is released
+    stale_dirs = []
+    with sessions_lock:
+        for cache_dir in CACHE_DIR.iterdir():
+            try:
+                glb_stat = (cache_dir / "model.glb").stat()
+            except OSError:
+                continue
+            if glb_stat.st_nlink == 1 and now - glb_stat.st_ctime > SESSION_TTL:
+                stale_dir = cache_dir.with_name(f"{cache_dir.name}.expired")
+                cache_dir.rename(stale_dir)
+                stale_dirs.append(stale_dir)
+    for stale_dir in stale_dirs:
+        shutil.rmtree(stale_dir, ignore_errors=True)
+
+def touch_session(session_id):
+    """Mark a session as recently used; returns its info or None"""
+    with sessions_lock:
+        session_info = active_models.get(session_id)
+        if session_info is not None:
+            active_models.move_to_end(session_id)
+    return session_info
+
+def link_file(source, target):
+    """Hard-link source to target, copying where links fail; an existing target is kept"""
+    try:
+        os.link(source, target)
+    except FileExistsError:
+        pass
+    except OSError:
+        shutil.copyfile(source, target)
+
+def link_cached_model(cache_dir, session_dir):
+    """Hard-link a cached conversion's files into a session directory (copy where links fail)"""
+    for name in ("model.glb", "model_metadata.json"):
+        link_file(cache_dir / name, session_dir / name)
+
+def cache_job_input(cache_key):
+    """Path of the GML file a conversion of cache_key reads, independent of any session"""
+    return CACHE_DIR / f"{cache_key}.gml"
+
+def finish_cache_job(cache_key, future):
+    """Forget a finished conversion so later uploads of that content use the cache"""
+    with sessions_lock:
+        cache_jobs.pop(cache_key, None)
+        cache_job_input(cache_key).unlink(missing_ok=True)
+
+def finish_conversion(session_id, future):
     """
-    Run the CityGML to GLB conversion script.
-    Returns (success: bool, message: str)
+    Record the outcome of a background conversion.
+    Files of failed conversions are removed; the session keeps the error for /status.
     """
+    conversion_jobs.pop(session_id, None)
+    
+    # Session was cleaned up before the conversion finished
+    with sessions_lock:
+        session_info = active_models.get(session_id)
+    if session_info is None:
+        return
+    
     try:
-        # Check if conversion script exists
-        convert_script = Path("gml2glb.py")
-        if not convert_script.exists():
-            return False, "Conversion script (gml2glb.py) not found"
-        
-        # Output file path
-        glb_output = output_dir / "model.glb"
-        
-        # Run conversion
-        cmd = [
-            sys.executable,
-            str(convert_script),
-            str(gml_path),
-            str(glb_output)
-        ]
-        
-        print(f"Running: {' '.join(cmd)}")
-        
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            timeout=300  # 5 minute timeout
-        )
-        
-        if result.returncode != 0:
-            error_msg = result.stderr or result.stdout or "Unknown error"
-            print(f"Conversion failed: {error_msg}")
-            return False, f"Conversion failed: {error_msg}"
-        
-        # Print conversion output
-        if result.stdout:
-            print(f"Conversion output:\\n{result.stdout}")
-        
-        # Verify output files exist
-        glb_file = output_dir / "model.glb"
-        metadata_file = output_dir / "model_metadata.json"
-        
-        if not glb_file.exists():
-            return False, "GLB file was not generated"
-        
-        if not metadata_file.exists():
-            return False, "Metadata file was not generated"
-        
-        print(f"✅ GLB conversion successful: {glb_file.stat().st_size} bytes")
-        print(f"✅ Metadata generated: {metadata_file.stat().st_size} bytes")
-        
-        return True, "Success"
-        
-    except subprocess.TimeoutExpired:
-        return False, "Conversion timeout (exceeded 5 minutes)"
+        success, message = future.result()
+        if success:
+            link_cached_model(Path(session_info["cache_dir"]), Path(session_info["session_dir"]))
     except Exception as e:
-        return False, f"Conversion error: {str(e)}"
+        success, message = False, f"Conversion error: {str(e)}"
+    
+    if success:
+        session_info["status"] = "done"
+        logger.info("[%s] Conversion successful!", session_info['created'])
+    else:
+        # Cleanup on failure
+        shutil.rmtree(session_info["session_dir"], ignore_errors=True)
+        Path(session_info["gml_path"]).unlink(missing_ok=True)
+        session_info["status"] = "error"
+        session_info["error"] = message
+        logger.error("[%s] Conversion failed (Session: %s)", session_info['created'], session_id)
+
+def submit_conversion(gml_path, output_dir, session_id):
+    """
+    Queue run_conversion in the worker pool, starting a new pool if a crashed worker broke it.
+    Callers hold sessions_lock, so only one thread replaces the pool.
+    """
+    global executor
+    try:
+        return executor.submit(run_conversion, gml_path, output_dir, session_id)
+    except BrokenProcessPool:
+        logger.error("Conversion worker pool broken by a crashed worker; starting a new pool")
+        executor.shutdown(wait=False)
+        executor = start_conversion_pool()
+        return executor.submit(run_conversion, gml_path, output_dir, session_id)
+
+@app.route('/status/<session_id>', methods=['GET'])
+def conversion_status(session_id):
+    """Report the state of a session's conversion: queued, running, done or error"""
+    session_info = touch_session(session_id)
+    if session_info is None:
+        return jsonify({"error": "Session not found"}), 404
+    
+    status = session_info["status"]
+    future = conversion_jobs.get(session_id)
+    if status == "queued" and future is not None and future.running():
+        status = "running"
+    
+    response = {
+        "session_id": session_id,
+        "filename": session_info["filename"],
+        "status": status
+    }
+    if status == "done":
+        response["files"] = session_files(session_id)
+    elif status == "error":
+        response["error"] = session_info["error"]
+    
+    return jsonify(response), 200
 
 @app.route('/models/<session_id>/<filename>', methods=['GET'])
 def serve_model(session_id, filename):
@@ -184,8 +509,27 @@ def serve_model(session_id, filename):
         session_dir = TEMP_DIR / session_id
         if not session_dir.exists():
             return jsonify({"error": "Session not found"}), 404
-        
-        return send_from_directory(session_dir, filename)
+        touch_session(session_id)
+        
+        # Refuse paths that resolve outside the temp directory
+        full_path = (session_dir / filename).resolve()
+        try:
+            full_path.relative_to(TEMP_DIR.resolve())
+        except ValueError:
+            return jsonify({"error": "File not found"}), 404
+        
+        if not full_path.is_file():
+            return jsonify({"error": "File not found"}), 404
+        
+        # Session files never change once written, so let clients cache them;
+        # conditional responses also answer Range requests and If-None-Match
+        return send_file(
+            full_path,
+            mimetype=MODEL_MIMETYPES.get(full_path.suffix),
+            conditional=True,
+            etag=True,
+            max_age=MODEL_MAX_AGE
+        )
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -202,38 +546,24 @@ def serve_static(filename):
 def cleanup_session(session_id):
     """Delete temporary files for a session"""
     try:
-        if session_id not in active_models:
+        if not evict_session(session_id):
             return jsonify({"error": "Session not found"}), 404
         
-        # Get session info
-        session_info = active_models[session_id]
-        
-        # Delete session directory
-        session_dir = Path(session_info["session_dir"])
-        if session_dir.exists():
-            shutil.rmtree(session_dir)
-        
-        # Delete uploaded GML file
-        gml_path = Path(session_info["gml_path"])
-        if gml_path.exists():
-            gml_path.unlink()
-        
-        # Remove from active sessions
-        del active_models[session_id]
-        
-        print(f"Cleaned up session: {session_id}")
+        logger.info("Cleaned up session: %s", session_id)
         return jsonify({"message": "Session cleaned up successfully"}), 200
         
     except Exception as e:
-        print(f"Cleanup error: {str(e)}")
+        logger.error("Cleanup error: %s", e)
         return jsonify({"error": f"Cleanup failed: {str(e)}"}), 500
 
 @app.route('/sessions', methods=['GET'])
 def list_sessions():
     """List all active sessions"""
+    with sessions_lock:
+        sessions = dict(active_models)
     return jsonify({
-        "sessions": active_models,
-        "count": len(active_models)
+        "sessions": sessions,
+        "count": len(sessions)
     })
 
 @app.route('/cleanup-all', methods=['DELETE'])
@@ -241,23 +571,19 @@ def cleanup_all():
     """Cleanup all temporary files"""
     try:
         count = 0
-        for session_id in list(active_models.keys()):
-            try:
-                session_info = active_models[session_id]
-                
-                # Delete directories
-                session_dir = Path(session_info["session_dir"])
-                if session_dir.exists():
-                    shutil.rmtree(session_dir)
-                
-                gml_path = Path(session_info["gml_path"])
-                if gml_path.exists():
-                    gml_path.unlink()
-                
-                del active_models[session_id]
-                count += 1
-            except Exception as e:
-                print(f"Error cleaning session {session_id}: {e}")
+        with sessions_lock:
+            session_ids = list(active_models)
+        
+        # Deleting files is I/O bound, so sessions are removed in parallel threads
+        with ThreadPoolExecutor(max_workers=CLEANUP_WORKERS) as cleanup_executor:
+            futures = {cleanup_executor.submit(evict_session, session_id): session_id
+                       for session_id in session_ids}
+            for future in as_completed(futures):
+                try:
+                    if future.result():
+                        count += 1
+                except Exception as e:
+                    logger.error("Error cleaning session %s: %s", futures[future], e)
         
         return jsonify({
             "message": f"Cleaned up {count} sessions",
@@ -267,23 +593,38 @@ def cleanup_all():
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+def start_background_threads():
+    """Start the log listener and the eviction loop for the life of the server"""
+    log_listener.start()
+    atexit.register(log_listener.stop)
+    threading.Thread(target=evict_expired_sessions, daemon=True).start()
+
+# Started with `python server.py`, conversion workers re-import this script as
+# __mp_main__; only the server process itself runs the background threads
+if __name__ != '__mp_main__':
+    start_background_threads()
+
 if __name__ == '__main__':
     print("=" * 60)
     print("CityGML Conversion Server")
     print("=" * 60)
     print(f"Temporary files: {TEMP_DIR.absolute()}")
     print(f"Upload directory: {UPLOAD_DIR.absolute()}")
+    print(f"Conversion cache: {CACHE_DIR.absolute()}")
     print("\nEndpoints:")
     print("  GET  /api            - 📖 Swagger UI (Interactive API docs)")
     print("  GET  /api-docs       - OpenAPI specification (YAML)")
     print("  GET  /health         - Health check")
-    print("  POST /upload         - Upload and convert GML file")
+    print("  POST /upload         - Upload GML file and start conversion")
+    print("  GET  /status/<id>    - Conversion status")
     print("  GET  /models/<id>/<file> - Serve converted files")
     print("  DELETE /cleanup/<id> - Delete session files")
     print("  GET  /sessions       - List active sessions")
     print("  DELETE /cleanup-all  - Delete all temporary files")
     print("\n🚀 Interactive API Documentation: http://localhost:5001/api")
-    print("Starting server on http://localhost:5001")
+    print("Starting development server on http://localhost:5001")
+    print("For production, run: ./scripts/start_server.sh")
     print("=" * 60)
     
-    app.run(host='0.0.0.0', port=5001, debug=True)
+    # Debugger and reloader only when explicitly requested with DEV=1
+    app.run(host='0.0.0.0', port=5001, debug=os.environ.get('DEV') == '1', threaded=True)
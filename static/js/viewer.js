@@ -94,6 +94,10 @@
             listContainer.innerHTML = '';
             listCount.textContent = objects.length;
 
+            // Build the items off-document and insert them in one go,
+            // so a large model triggers a single layout instead of one per item
+            const fragment = document.createDocumentFragment();
+
             objects.forEach(obj => {
                 const item = document.createElement('div');
                 item.className = 'object-item';
@@ -110,11 +114,20 @@
                     <div class="object-stats">${obj.polygon_count || obj.polygonCount} polygons</div>
                 `;
 
-                item.addEventListener('click', () => selectObject(obj.id));
-                listContainer.appendChild(item);
+                fragment.appendChild(item);
             });
+
+            listContainer.appendChild(fragment);
         }
 
+        // One delegated click handler for every list item
+        document.getElementById('object-items').addEventListener('click', (e) => {
+            const item = e.target.closest('.object-item');
+            if (item) {
+                selectObject(item.dataset.id);
+            }
+        });
+
         // Search functionality
         document.getElementById('search-box').addEventListener('input', (e) => {
             const query = e.target.value.toLowerCase();
@@ -165,7 +178,8 @@
                 emissive: 0x5500aa,
                 emissiveIntensity: 0.5,
                 roughness: 0.3,
-                metalness: 0.1
+                metalness: 0.1,
+                flatShading: true
             });
 
             // Apply highlight to this mesh only
@@ -349,7 +363,8 @@
                         emissive: 0x886600,
                         emissiveIntensity: 0.3,
                         roughness: 0.4,
-                        metalness: 0.1
+                        metalness: 0.1,
+                        flatShading: true
                     });
                     mesh.material = hoverMaterial;
                     renderer.domElement.style.cursor = 'pointer';
@@ -426,6 +441,7 @@
         // Current session management
         let currentSession = null;
         const BACKEND_URL = 'http://localhost:5001';
+        const STATUS_POLL_INTERVAL = 1000; // ms between conversion status checks
 
         // Upload Modal Functions
         function openUploadModal() {
@@ -510,7 +526,25 @@
                     throw new Error(error.error || 'Upload failed');
                 }
 
-                const result = await response.json();
+                let result = await response.json();
+
+                // Conversion runs in the background; poll until it finishes
+                while (result.status === 'queued' || result.status === 'running') {
+                    updateProgress(50, 'Optimizing 3D Data...');
+                    await new Promise(resolve => setTimeout(resolve, STATUS_POLL_INTERVAL));
+
+                    const statusResponse = await fetch(`${BACKEND_URL}/status/${result.session_id}`);
+                    if (!statusResponse.ok) {
+                        const error = await statusResponse.json();
+                        throw new Error(error.error || 'Conversion status unavailable');
+                    }
+                    result = await statusResponse.json();
+                }
+
+                if (result.status === 'error') {
+                    throw new Error(result.error || 'Conversion failed');
+                }
+
                 updateProgress(80, 'Loading model...');
 
                 // Cleanup previous session if exists
@@ -703,10 +737,9 @@
                                 }
                                 objectMeshMap[objectId].push(child);
 
-                                // PERFORMANCE BOOST: Optimize geometry
-                                if (child.geometry) {
-                                    child.geometry.computeVertexNormals();
-                                }
+                                // Vertices are shared between a building's surfaces, so
+                                // shade per face (flatShading) instead of computing
+                                // smoothed vertex normals
 
                                 // Color coding by type (from metadata)
                                 if (metadata && metadata.objects && metadata.objects[objectId]) {
@@ -718,25 +751,25 @@
                                         child.material = new THREE.MeshLambertMaterial({
                                             color: 0x4169E1,
                                             side: THREE.DoubleSide,
-                                            flatShading: false
+                                            flatShading: true
                                         });
                                     } else if (elementType === 'RoofSurface') {
                                         child.material = new THREE.MeshLambertMaterial({
                                             color: 0x8B4513,
                                             side: THREE.DoubleSide,
-                                            flatShading: false
+                                            flatShading: true
                                         });
                                     } else if (elementType === 'WallSurface') {
                                         child.material = new THREE.MeshLambertMaterial({
                                             color: 0xCCCCCC,
                                             side: THREE.DoubleSide,
-                                            flatShading: false
+                                            flatShading: true
                                         });
                                     } else if (elementType === 'GroundSurface') {
                                         child.material = new THREE.MeshLambertMaterial({
                                             color: 0x228B22,
                                             side: THREE.DoubleSide,
-                                            flatShading: false
+                                            flatShading: true
                                         });
                                     }
                                 }
@@ -0,0 +1,8 @@
+#!/usr/bin/env python3
+"""
+WSGI entry point for the CityGML Conversion Server
+
+Run with: gunicorn -w 1 -k gthread --threads 8 -b 0.0.0.0:5001 wsgi:app
+"""
+
+from server import app